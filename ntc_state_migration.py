@@ -55,12 +55,135 @@ import glob
 import os
 import re
 import sys
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+# =============================================================================
+# RECORDS
+# =============================================================================
+
+@dataclass
+class ParsedAddr:
+    """Components of a parsed Terraform state address."""
+
+    __slots__ = (
+        "original", "region_key", "region", "is_data", "resource_type",
+        "resource_name", "has_count_index", "count_index", "foreach_key",
+        "resource_id",
+    )
+
+    original: str
+    region_key: str
+    region: str
+    is_data: bool
+    resource_type: str
+    resource_name: str
+    has_count_index: bool
+    count_index: Optional[str]
+    foreach_key: Optional[str]
+    resource_id: str
+
+
+@dataclass
+class MoveResult:
+    """Classification of one FROM address and its generated TO address."""
+
+    __slots__ = (
+        "from_addr", "to_addr", "category", "region", "resource_id",
+        "confidence", "note",
+    )
+
+    from_addr: str
+    to_addr: Optional[str]
+    category: str
+    region: str
+    resource_id: str
+    confidence: str
+    note: str
+
 
 # =============================================================================
 # PARSING
 # =============================================================================
 
+_ADDR_PREFIX = "module.baseline_"
+_UNIFIED_PREFIX = "module.baseline_unified[0]."
+
+# Module region key → AWS region, filled on first use
+_REGION_CACHE = {"unified": "unified"}
+
+# One state address per line, for batch scanning with finditer in
+# parse_state_addresses (parse_state_address parses single lines with string
+# operations instead; keep both in sync with the same grammar). The trailing
+# (.*) alternative matches any line that is not a valid address, so every
+# line yields exactly one match. Resource names keep [\w-]: Terraform
+# identifiers may contain hyphens (e.g. aws_s3_bucket.ntc-logs), and the
+# pattern is fully anchored so the class cannot cause runaway backtracking.
+_ADDR_LINE_RE = re.compile(
+    r'(?m)^(?:'
+    r'module\.baseline_(\w+)\[0\]\.'             # module.baseline_<key>[0].
+    r'(data\.)?'                                 # optional data.
+    r'(\w+)\.'                                   # resource type
+    r'([\w-]+)'                                  # resource name (may contain hyphens)
+    r'(?:\[(\d+)\])?'                            # optional [N] index
+    r'(?:\["([^"\n]+)"\])?'                      # optional ["key"] for_each index
+    r'|(.*))$'                                   # anything else: unparseable
+)
+
+
+def _is_word(s, extra=""):
+    """Return True if s is non-empty and matches [\\w<extra>]+."""
+    s = s.replace("_", "a")
+    for c in extra:
+        s = s.replace(c, "a")
+    return s.isalnum()
+
+
+def _split_resource(tail):
+    """Split '<type>.<name>[N]["key"]' into its parts, or None if malformed."""
+    resource_type, sep, rest = tail.partition(".")
+    if not sep or not _is_word(resource_type):
+        return None
+
+    # Scan suffixes from the right: optional ["key"], then optional [N]
+    foreach_key = None
+    if rest.endswith('"]'):
+        idx = rest.rfind('["')
+        if idx == -1:
+            return None
+        foreach_key = rest[idx + 2 : -2]
+        if not foreach_key or '"' in foreach_key:
+            return None
+        rest = rest[:idx]
+
+    count_index = None
+    if rest.endswith("]"):
+        idx = rest.rfind("[")
+        if idx == -1:
+            return None
+        count_index = rest[idx + 1 : -1]
+        if not count_index.isdecimal():
+            return None
+        rest = rest[:idx]
+
+    # Resource name (Terraform identifiers may contain hyphens)
+    if not _is_word(rest, "-"):
+        return None
+
+    return resource_type, rest, count_index, foreach_key
+
+
+# Template resource declaration: resource "<type>" "<name>" {
+_RESOURCE_DECL_RE = re.compile(r'^resource\s+"(\w+)"\s+"([\w${}./-]+)"\s*\{')
+_FOREACH_RE = re.compile(r'\bfor_each\b')
+_COUNT_RE = re.compile(r'\bcount\b')
+
+# Template variable interpolation: ${...}
+_TVAR_RE = re.compile(r'\$\{[^}]+\}')
+
+
 def parse_state_address(addr):
     """Parse a Terraform state address into its components.
 
@@ -73,103 +196,168 @@ def parse_state_address(addr):
     if not addr:
         return None
 
-    # Legacy/unified pattern with optional numeric index [N]
-    pattern = (
-        r'^module\.baseline_(\w+)\[0\]\.'          # module.baseline_<key>[0].
-        r'(data\.)?'                                 # optional data.
-        r'(\w+)\.'                                   # resource type
-        r'([\w-]+)'                                  # resource name (may contain hyphens)
-        r'(?:\[(\d+)\])?'                            # optional [N] index
-        r'(?:\["([^"]+)"\])?'                        # optional ["key"] for_each index
-        r'$'
-    )
-    m = re.match(pattern, addr)
-    if not m:
+    # module.baseline_<key>[0].
+    if not addr.startswith(_ADDR_PREFIX):
+        return None
+    region_key, sep, tail = addr[len(_ADDR_PREFIX):].partition("[0].")
+    if not sep or not _is_word(region_key):
         return None
 
-    region_key = m.group(1)
-    is_data = m.group(2) is not None
-    resource_type = m.group(3)
-    resource_name = m.group(4)
-    count_index = m.group(5)
-    foreach_key = m.group(6)
+    # Optional data. prefix; fall back to treating "data" as the resource
+    # type if the remainder is not a valid <type>.<name> pair
+    parts = None
+    is_data = tail.startswith("data.")
+    if is_data:
+        parts = _split_resource(tail[5:])
+        if parts is None:
+            is_data = False
+    if parts is None:
+        parts = _split_resource(tail)
+        if parts is None:
+            return None
+
+    resource_type, resource_name, count_index, foreach_key = parts
+    return _build_parsed(
+        addr, region_key, is_data, resource_type, resource_name,
+        count_index, foreach_key,
+    )
+
 
+def parse_state_addresses(addresses):
+    """Parse many state addresses in a single regex scan.
+
+    Yields (address, parsed) pairs in input order, where parsed is what
+    parse_state_address would return for that address. The two use separate
+    implementations of the same grammar (regex scan vs. string parsing);
+    tests/test_ntc_state_migration.py keeps them in agreement.
+    """
+    if not addresses:
+        return
+
+    # An embedded newline can never be a valid address. Blank it out so it
+    # still occupies exactly one line of the scan buffer.
+    stripped = [a.strip() for a in addresses]
+    lines = ["" if "\n" in line else line for line in stripped]
+    matches = list(_ADDR_LINE_RE.finditer("\n".join(lines)))
+    if len(matches) != len(lines):
+        raise RuntimeError(
+            f"Address scan produced {len(matches)} matches for {len(lines)} lines"
+        )
+
+    for addr, line, m in zip(addresses, stripped, matches):
+        if m.group(7) is not None:
+            yield addr, None
+            continue
+        region_key, data, resource_type, resource_name, count_index, foreach_key, _ = m.groups()
+        yield addr, _build_parsed(
+            line, region_key, data is not None, resource_type, resource_name,
+            count_index, foreach_key,
+        )
+
+
+def _build_parsed(addr, region_key, is_data, resource_type, resource_name,
+                  count_index, foreach_key):
+    """Assemble a ParsedAddr from the address components."""
     # Convert module region key to AWS region
     # eu_central_1 → eu-central-1, us_east_1 → us-east-1
-    if region_key == "unified":
-        region = "unified"
-    else:
-        region = region_key.replace("_", "-")
-
-    return {
-        "original": addr,
-        "region_key": region_key,
-        "region": region,
-        "is_data": is_data,
-        "resource_type": resource_type,
-        "resource_name": resource_name,
-        "has_count_index": count_index is not None,
-        "count_index": count_index,
-        "foreach_key": foreach_key,
-        "resource_id": f"{'data.' if is_data else ''}{resource_type}.{resource_name}",
-    }
+    # Only a handful of regions occur, so translate each key once
+    region = _REGION_CACHE.get(region_key)
+    if region is None:
+        region = _REGION_CACHE[region_key] = sys.intern(region_key.replace("_", "-"))
+
+    return ParsedAddr(
+        original=addr,
+        region_key=region_key,
+        region=region,
+        is_data=is_data,
+        resource_type=resource_type,
+        resource_name=resource_name,
+        has_count_index=count_index is not None,
+        count_index=count_index,
+        foreach_key=foreach_key,
+        resource_id=f"{'data.' if is_data else ''}{resource_type}.{resource_name}",
+    )
 
 
 def parse_unified_templates(template_paths):
     """Parse unified template files to determine resource count/for_each behavior.
 
+    Files are read and parsed concurrently; patterns are returned in the
+    order of template_paths.
+
     Returns a list of dicts with:
       - type: resource type (e.g., aws_iam_role)
       - name_pattern: regex pattern for resource name
       - mode: 'for_each', 'count', or 'none'
     """
+    if not template_paths:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(8, len(template_paths))) as ex:
+        per_file = list(ex.map(_parse_one_template, template_paths))
+
+    return [tp for patterns in per_file for tp in patterns]
+
+
+def _parse_one_template(path):
+    """Parse a single unified template file into resource patterns."""
     resource_patterns = []
 
-    for path in template_paths:
-        with open(path) as f:
-            lines = f.readlines()
+    # The block lookahead needs random access, so read once and split.
+    # Split on "\n" only: splitlines() also breaks on \f, \v, \x85, \u2028
+    # etc., which would shift the lookahead window.
+    with open(path) as f:
+        lines = f.read().split("\n")
 
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
 
-            # Match resource declarations
-            m = re.match(
-                r'^resource\s+"(\w+)"\s+"([\w${}./-]+)"\s*\{',
-                line,
-            )
-            if m:
-                rtype = m.group(1)
-                rname_template = m.group(2)
+        # Cheap literal check first — most lines are not declarations
+        if not line.startswith("resource"):
+            i += 1
+            continue
 
-                # Check next 5 lines for count or for_each
-                block_preview = "\n".join(
-                    l.strip() for l in lines[i : i + 6]
-                )
+        # Match resource declarations
+        m = _RESOURCE_DECL_RE.match(line)
+        if m:
+            rtype = m.group(1)
+            rname_template = m.group(2)
 
-                if re.search(r'\bfor_each\b', block_preview):
-                    mode = "for_each"
-                elif re.search(r'\bcount\b', block_preview):
-                    mode = "count"
-                else:
-                    mode = "none"
-
-                # Convert template variable syntax to regex
-                # "ntc_baseline_iam_role__${iam_role_name}" → "ntc_baseline_iam_role__[\w-]+"
-                # Split on ${...}, escape literal parts, rejoin with regex wildcard
-                parts = re.split(r'\$\{[^}]+\}', rname_template)
+            # Check next 5 lines for count or for_each
+            block_preview = "\n".join(
+                l.strip() for l in lines[i : i + 6]
+            )
+
+            # Substring checks gate the regex; the word boundary is still
+            # needed since e.g. "account_id" contains "count"
+            if "for_each" in block_preview and _FOREACH_RE.search(block_preview):
+                mode = "for_each"
+            elif "count" in block_preview and _COUNT_RE.search(block_preview):
+                mode = "count"
+            else:
+                mode = "none"
+
+            # Convert template variable syntax to regex
+            # "ntc_baseline_iam_role__${iam_role_name}" → "ntc_baseline_iam_role__[\w-]+"
+            # Split on ${...}, escape literal parts, rejoin with regex wildcard
+            if "${" not in rname_template:
+                # Static name: nothing to split
+                name_regex = re.escape(rname_template)
+            else:
+                parts = _TVAR_RE.split(rname_template)
                 escaped_parts = [re.escape(p) for p in parts]
                 name_regex = r'[\w-]+'.join(escaped_parts)
 
-                resource_patterns.append({
-                    "type": rtype,
-                    "name_template": rname_template,
-                    "name_pattern": f"^{name_regex}$",
-                    "mode": mode,
-                    "source_file": os.path.basename(path),
-                })
+            resource_patterns.append({
+                "type": rtype,
+                "name_template": rname_template,
+                "name_pattern": f"^{name_regex}$",
+                "mode": mode,
+                "source_file": os.path.basename(path),
+            })
 
-            i += 1
+        i += 1
 
     return resource_patterns
 
@@ -185,15 +373,18 @@ def find_unified_templates(templates_arg):
     if not templates_arg:
         return []
 
-    paths = []
-
     if os.path.isdir(templates_arg):
         # Directory: find all unified_*.tftpl files
         # Also handles upload prefix patterns like "12345_unified_*.tftpl"
-        for f in sorted(os.listdir(templates_arg)):
-            if f.endswith(".tftpl") and "unified_" in f:
-                paths.append(os.path.join(templates_arg, f))
-    elif "," in templates_arg:
+        # DirEntry.is_file() reuses the dirent type, so no extra stat per file
+        with os.scandir(templates_arg) as it:
+            return sorted(
+                e.path
+                for e in it
+                if e.name.endswith(".tftpl") and "unified_" in e.name and e.is_file()
+            )
+
+    if "," in templates_arg:
         # Comma-separated list
         paths = [p.strip() for p in templates_arg.split(",")]
     else:
@@ -210,7 +401,7 @@ def find_unified_templates(templates_arg):
 def classify_resources(from_addresses, main_region, template_patterns):
     """Classify each FROM address as data/global/regional and determine TO address.
 
-    Returns a list of dicts with:
+    Returns a list of MoveResult records with:
       - from_addr: original state address
       - to_addr: generated unified state address
       - category: 'skip_data', 'global_no_count', 'global_with_count', 'regional'
@@ -218,52 +409,78 @@ def classify_resources(from_addresses, main_region, template_patterns):
       - confidence: 'template' or 'heuristic'
     """
     parsed = []
-    for addr in from_addresses:
-        p = parse_state_address(addr)
+    for addr, p in parse_state_addresses(from_addresses):
         if p:
             parsed.append(p)
         else:
             print(f"WARNING: Could not parse address: {addr}", file=sys.stderr)
 
-    # Group by resource_id to detect which resources appear in multiple regions
-    by_resource = defaultdict(list)
-    for p in parsed:
-        by_resource[p["resource_id"]].append(p)
-
-    # Detect regional resources: appear in multiple region modules
+    # Detect regional resources: appear in multiple region modules.
+    # Only the first region per resource_id needs remembering.
+    first_region = {}
     regional_resources = set()
-    for rid, entries in by_resource.items():
-        regions = set(e["region"] for e in entries)
-        if len(regions) > 1:
+    for p in parsed:
+        rid = p.resource_id
+        prev = first_region.get(rid)
+        if prev is None:
+            first_region[rid] = p.region
+        elif prev != p.region:
             regional_resources.add(rid)
 
-    # Build template lookup
+    # Build template lookup: per resource type, one alternation of all name
+    # patterns with a capture group each, so a single match finds the first
+    # matching template and lastindex says which one it was
+    by_type = defaultdict(list)
+    for tp in template_patterns:
+        by_type[tp["type"]].append(tp)
+
+    patterns_by_type = {}
+    for rtype, tps in by_type.items():
+        combined = re.compile(
+            "^(?:" + "|".join(f"({tp['name_pattern'][1:-1]})$" for tp in tps) + ")"
+        )
+        patterns_by_type[rtype] = (
+            combined,
+            [(tp["mode"], tp["source_file"]) for tp in tps],
+        )
+
+    # The same type/name pair recurs once per region, so memoize lookups
+    match_cache = {}
+
     def match_template(resource_type, resource_name):
         """Find matching template pattern and return its mode."""
-        for tp in template_patterns:
-            if tp["type"] == resource_type:
-                if re.match(tp["name_pattern"], resource_name):
-                    return tp["mode"], tp["source_file"]
-        return None, None
+        key = (resource_type, resource_name)
+        hit = match_cache.get(key)
+        if hit is not None:
+            return hit
+
+        hit = (None, None)
+        if resource_type in patterns_by_type:
+            combined, targets = patterns_by_type[resource_type]
+            m = combined.match(resource_name)
+            if m:
+                hit = targets[m.lastindex - 1]
+        match_cache[key] = hit
+        return hit
 
     results = []
     for p in parsed:
         # --- Case: Data source → skip ---
-        if p["is_data"]:
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": None,
-                "category": "skip_data",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": "rule",
-                "note": "Data sources are re-computed, no moved block needed",
-            })
+        if p.is_data:
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=None,
+                category="skip_data",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence="rule",
+                note="Data sources are re-computed, no moved block needed",
+            ))
             continue
 
         # Determine unified mode from templates
         template_mode, source_file = match_template(
-            p["resource_type"], p["resource_name"]
+            p.resource_type, p.resource_name
         )
 
         # --- Case: Regional resource ---
@@ -272,104 +489,98 @@ def classify_resources(from_addresses, main_region, template_patterns):
         if template_mode == "for_each":
             is_regional = True
             confidence = "template"
-        elif p["resource_id"] in regional_resources:
+        elif p.resource_id in regional_resources:
             is_regional = True
             confidence = "heuristic" if not template_mode else "template"
-        elif p["region"] != main_region and not p["has_count_index"]:
+        elif p.region != main_region and not p.has_count_index:
             # In non-main region without [0] → likely regional
             is_regional = True
             confidence = "heuristic"
 
         if is_regional:
             to_addr = (
-                f'module.baseline_unified[0].'
-                f'{p["resource_type"]}.{p["resource_name"]}'
-                f'["{p["region"]}"]'
+                _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name
+                + '["' + p.region + '"]'
             )
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": to_addr,
-                "category": "regional",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": confidence,
-                "note": f"Regional → for_each with region key",
-            })
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=to_addr,
+                category="regional",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence=confidence,
+                note=f"Regional → for_each with region key",
+            ))
             continue
 
         # --- Case: Global resource ---
         if template_mode == "count":
             # Unified template still has count → keep [0]
             to_addr = (
-                f'module.baseline_unified[0].'
-                f'{p["resource_type"]}.{p["resource_name"]}[0]'
+                _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name + "[0]"
             )
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": to_addr,
-                "category": "global_with_count",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": "template",
-                "note": f"Global, count kept (from {source_file})",
-            })
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=to_addr,
+                category="global_with_count",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence="template",
+                note=f"Global, count kept (from {source_file})",
+            ))
         elif template_mode == "none":
             # Unified template has no count → remove [0]
             to_addr = (
-                f'module.baseline_unified[0].'
-                f'{p["resource_type"]}.{p["resource_name"]}'
+                _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name
             )
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": to_addr,
-                "category": "global_no_count",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": "template",
-                "note": f"Global, count removed (from {source_file})",
-            })
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=to_addr,
+                category="global_no_count",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence="template",
+                note=f"Global, count removed (from {source_file})",
+            ))
         elif template_mode is None:
             # No template match → use heuristic
             # Default: assume count is removed (most common case)
-            if p["has_count_index"]:
+            if p.has_count_index:
                 to_addr = (
-                    f'module.baseline_unified[0].'
-                    f'{p["resource_type"]}.{p["resource_name"]}'
+                    _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name
                 )
                 note = "Global, count removed (HEURISTIC — verify!)"
             else:
                 to_addr = (
-                    f'module.baseline_unified[0].'
-                    f'{p["resource_type"]}.{p["resource_name"]}'
+                    _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name
                 )
                 note = "Global, no index (HEURISTIC — verify!)"
 
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": to_addr,
-                "category": "global_heuristic",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": "heuristic",
-                "note": note,
-            })
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=to_addr,
+                category="global_heuristic",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence="heuristic",
+                note=note,
+            ))
         else:
             # template_mode is for_each but we didn't classify as regional
             # This shouldn't happen, but handle gracefully
             to_addr = (
-                f'module.baseline_unified[0].'
-                f'{p["resource_type"]}.{p["resource_name"]}'
-                f'["{p["region"]}"]'
+                _UNIFIED_PREFIX + p.resource_type + "." + p.resource_name
+                + '["' + p.region + '"]'
             )
-            results.append({
-                "from_addr": p["original"],
-                "to_addr": to_addr,
-                "category": "regional",
-                "region": p["region"],
-                "resource_id": p["resource_id"],
-                "confidence": "template",
-                "note": "Regional (for_each from template)",
-            })
+            results.append(MoveResult(
+                from_addr=p.original,
+                to_addr=to_addr,
+                category="regional",
+                region=p.region,
+                resource_id=p.resource_id,
+                confidence="template",
+                note="Regional (for_each from template)",
+            ))
 
     return results
 
@@ -383,10 +594,8 @@ def validate_against_to_state(results, to_addresses):
 
     Returns a list of issues found.
     """
-    to_set = set(a.strip() for a in to_addresses if a.strip())
-    generated_to = set(
-        r["to_addr"] for r in results if r["to_addr"] is not None
-    )
+    to_set = {s for s in (a.strip() for a in to_addresses) if s}
+    generated_to = {r.to_addr for r in results if r.to_addr is not None}
 
     issues = []
 
@@ -401,13 +610,10 @@ def validate_against_to_state(results, to_addresses):
 
     # Check: actual TO addresses that we didn't generate a move for
     # (excluding data sources which we skip)
-    actual_resources = set(
-        a for a in to_set if not a.startswith("module.baseline_unified[0].data.")
-    )
-    covered = set(
-        r["to_addr"] for r in results if r["to_addr"] is not None
-    )
-    not_covered = actual_resources - covered
+    actual_resources = {
+        a for a in to_set if not a.startswith(_UNIFIED_PREFIX + "data.")
+    }
+    not_covered = actual_resources - generated_to
     for addr in sorted(not_covered):
         issues.append({
             "type": "NOT_COVERED",
@@ -422,10 +628,9 @@ def validate_against_to_state(results, to_addresses):
 # OUTPUT
 # =============================================================================
 
-def format_hcl(results, include_comments=True):
-    """Format results as HCL baseline_moved_resources block."""
-    lines = []
-    lines.append("  baseline_moved_resources = [")
+def iter_hcl_lines(results, include_comments=True):
+    """Yield the lines of the HCL baseline_moved_resources block."""
+    yield "  baseline_moved_resources = ["
 
     # Group by category for readable output
     categories = [
@@ -435,57 +640,67 @@ def format_hcl(results, include_comments=True):
         ("global_heuristic", "GLOBAL RESOURCES — heuristic (VERIFY MANUALLY!)"),
     ]
 
+    # Bucket results by category in a single pass
+    buckets = defaultdict(list)
+    for r in results:
+        buckets[r.category].append(r)
+
     for cat_key, cat_title in categories:
-        cat_results = [r for r in results if r["category"] == cat_key]
+        cat_results = buckets.get(cat_key)
         if not cat_results:
             continue
 
         if include_comments:
-            lines.append("")
-            lines.append(f"    # {'=' * 70}")
-            lines.append(f"    # {cat_title}")
-            lines.append(f"    # {'=' * 70}")
+            yield ""
+            yield f"    # {'=' * 70}"
+            yield f"    # {cat_title}"
+            yield f"    # {'=' * 70}"
 
         # Group by resource_id for sub-headers
         current_resource = None
-        for r in sorted(cat_results, key=lambda x: (x["resource_id"], x["region"])):
-            if include_comments and r["resource_id"] != current_resource:
-                current_resource = r["resource_id"]
-                lines.append("")
-                lines.append(f"    # {r['resource_id']}")
+        for r in sorted(cat_results, key=lambda x: (x.resource_id, x.region)):
+            if include_comments and r.resource_id != current_resource:
+                current_resource = r.resource_id
+                yield ""
+                yield f"    # {r.resource_id}"
+
+            yield "    {"
+            yield f'      moved_from = "{r.from_addr}"'
+            yield f'      moved_to   = "{r.to_addr}"'
+            yield "    },"
+
+    yield "  ]"
+
+
+def format_hcl(results, include_comments=True):
+    """Format results as HCL baseline_moved_resources block."""
+    return "\n".join(iter_hcl_lines(results, include_comments))
 
-            lines.append("    {")
-            lines.append(f'      moved_from = "{r["from_addr"]}"')
-            lines.append(f'      moved_to   = "{r["to_addr"]}"')
-            lines.append("    },")
 
-    lines.append("  ]")
-    return "\n".join(lines)
+def iter_skipped_lines(results):
+    """Yield the lines of the skipped data sources comment block."""
+    skipped = [r for r in results if r.category == "skip_data"]
+    if not skipped:
+        return
+
+    yield "  # Skipped data sources (re-computed, no moved blocks needed):"
+    for r in sorted(skipped, key=lambda x: x.from_addr):
+        yield f"  #   {r.from_addr}"
 
 
 def format_skipped(results):
     """Format skipped data sources as a comment block."""
-    skipped = [r for r in results if r["category"] == "skip_data"]
-    if not skipped:
+    lines = list(iter_skipped_lines(results))
+    if not lines:
         return ""
 
-    lines = [
-        "",
-        "  # Skipped data sources (re-computed, no moved blocks needed):",
-    ]
-    for r in sorted(skipped, key=lambda x: x["from_addr"]):
-        lines.append(f"  #   {r['from_addr']}")
-
-    return "\n".join(lines)
+    return "\n".join([""] + lines)
 
 
 def print_summary(results, issues=None):
     """Print a summary to stderr."""
-    categories = defaultdict(int)
-    confidences = defaultdict(int)
-    for r in results:
-        categories[r["category"]] += 1
-        confidences[r["confidence"]] += 1
+    categories = Counter(r.category for r in results)
+    confidences = Counter(r.confidence for r in results)
 
     print("\n" + "=" * 60, file=sys.stderr)
     print("MIGRATION SUMMARY", file=sys.stderr)
@@ -497,7 +712,7 @@ def print_summary(results, issues=None):
     print(f"  Regional (for_each):          {categories.get('regional', 0)}", file=sys.stderr)
     print(f"  Global (heuristic):           {categories.get('global_heuristic', 0)}", file=sys.stderr)
     print(f"  ---", file=sys.stderr)
-    print(f"  Moved blocks generated:       {sum(1 for r in results if r['to_addr'])}", file=sys.stderr)
+    print(f"  Moved blocks generated:       {sum(1 for r in results if r.to_addr)}", file=sys.stderr)
     print(f"  Confidence: template-based:   {confidences.get('template', 0)}", file=sys.stderr)
     print(f"  Confidence: heuristic:        {confidences.get('heuristic', 0)}", file=sys.stderr)
 
@@ -579,7 +794,7 @@ def main():
             from_lines = f.readlines()
 
     from_addresses = [
-        line.strip() for line in from_lines if line.strip() and not line.strip().startswith("#")
+        s for s in (line.strip() for line in from_lines) if s and not s.startswith("#")
     ]
 
     if not from_addresses:
@@ -624,9 +839,7 @@ def main():
         with open(args.validate_file) as f:
             to_lines = f.readlines()
         to_addresses = [
-            line.strip()
-            for line in to_lines
-            if line.strip() and not line.strip().startswith("#")
+            s for s in (line.strip() for line in to_lines) if s and not s.startswith("#")
         ]
         issues = validate_against_to_state(results, to_addresses)
 
@@ -634,15 +847,20 @@ def main():
     print_summary(results, issues)
 
     # --- Generate output ---
-    output = format_hcl(results, include_comments=not args.no_comments)
-    if args.show_skipped:
-        output += format_skipped(results)
-
     if args.output == "-":
+        output = format_hcl(results, include_comments=not args.no_comments)
+        if args.show_skipped:
+            output += format_skipped(results)
         print(output)
     else:
-        with open(args.output, "w") as f:
-            f.write(output + "\n")
+        # Stream lines straight to the file instead of building one string
+        with open(args.output, "w", buffering=1 << 20) as f:
+            f.writelines(
+                line + "\n"
+                for line in iter_hcl_lines(results, include_comments=not args.no_comments)
+            )
+            if args.show_skipped:
+                f.writelines(line + "\n" for line in iter_skipped_lines(results))
         print(f"Output written to: {args.output}", file=sys.stderr)
 
 
@@ -0,0 +1,104 @@
+import os
+import random
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ntc_state_migration as m
+
+# Single-address grammar the tool has always accepted
+REFERENCE_RE = re.compile(
+    r'^module\.baseline_(\w+)\[0\]\.(data\.)?(\w+)\.([\w-]+)'
+    r'(?:\[(\d+)\])?(?:\["([^"]+)"\])?$'
+)
+
+ADDRESSES = [
+    "module.baseline_eu_central_1[0].aws_iam_role.ntc_config[0]",
+    "module.baseline_eu_central_1[0].data.aws_iam_policy_document.ntc_config[0]",
+    'module.baseline_unified[0].aws_config_configuration_recorder.ntc_config["eu-central-1"]',
+    "module.baseline_us_east_1[0].aws_s3_bucket.ntc-logs",
+    'module.baseline_us_east_1[0].aws_sns_topic.fe[0]["k"]',
+    'module.baseline_us_east_1[0].aws_sns_topic.fe["a.b"]',
+    'module.baseline_us_east_1[0].aws_sns_topic.fe["a[b"]',
+    'module.baseline_us_east_1[0].aws_sns_topic.fe[""]',
+    'module.baseline_us_east_1[0].aws_sns_topic.fe["x"y"]',
+    "module.baseline_us_east_1[0].data.thing",
+    "module.baseline_us_east_1[0].data.a-b.c",
+    "  module.baseline_us_east_1[0].aws_iam_role.padded\t",
+    "module.baseline_us_east_1[0].aws_iam_role.a\nmodule.baseline_us_east_1[0].aws_iam_role.b",
+    "module.baseline_us_east_1[1].aws_iam_role.a",
+    "module.baseline_us_east_1[0].aws_iam_role",
+    "garbage line",
+    "",
+    "   ",
+]
+
+
+def reference_parse(addr):
+    """Components per the reference grammar, or None."""
+    m_ = REFERENCE_RE.match(addr.strip())
+    if not m_ or "\n" in addr.strip():
+        return None
+    region_key, data, rtype, rname, count_index, foreach_key = m_.groups()
+    return (region_key, data is not None, rtype, rname, count_index, foreach_key)
+
+
+def components(parsed):
+    if parsed is None:
+        return None
+    return (
+        parsed.region_key, parsed.is_data, parsed.resource_type,
+        parsed.resource_name, parsed.count_index, parsed.foreach_key,
+    )
+
+
+def random_addresses(rng, count):
+    toks = [
+        "module.baseline_", "eu_central_1", "unified", "[0].", "[0]", "[12]",
+        "data.", "data", "aws_x", ".", "y", "a-b", '["k"]', '["a.b"]', "[",
+        '"', "]", "é", "-", "_", " ", "\t", "\n",
+    ]
+    out = []
+    for _ in range(count):
+        base = ["module.baseline_", "eu_central_1", "[0]."] if rng.random() < 0.8 else []
+        out.append("".join(base + [rng.choice(toks) for _ in range(rng.randint(0, 8))]))
+    return out
+
+
+class ParseStateAddressesTest(unittest.TestCase):
+
+    def test_single_and_batch_agree(self):
+        # parse_state_address (string parser) and parse_state_addresses
+        # (regex scan) implement the grammar independently
+        rng = random.Random(0)
+        cases = [ADDRESSES] + [random_addresses(rng, rng.randint(1, 8)) for _ in range(2000)]
+        for addrs in cases:
+            batch = list(m.parse_state_addresses(addrs))
+            self.assertEqual([a for a, _ in batch], addrs)
+            for addr, parsed in batch:
+                self.assertEqual(parsed, m.parse_state_address(addr), repr(addr))
+                self.assertEqual(components(parsed), reference_parse(addr), repr(addr))
+
+    def test_embedded_newline_does_not_shift_results(self):
+        addrs = [
+            "module.baseline_eu_central_1[0].aws_iam_role.a\n"
+            "module.baseline_eu_central_1[0].aws_iam_role.b",
+            "module.baseline_us_east_1[0].aws_s3_bucket.c",
+        ]
+        parsed = [p for _, p in m.parse_state_addresses(addrs)]
+        self.assertIsNone(parsed[0])
+        self.assertEqual(parsed[1].resource_id, "aws_s3_bucket.c")
+
+        results = m.classify_resources(addrs, "eu-central-1", [])
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].from_addr, addrs[1])
+        self.assertEqual(
+            results[0].to_addr,
+            'module.baseline_unified[0].aws_s3_bucket.c["us-east-1"]',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()